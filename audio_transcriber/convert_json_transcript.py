@@ -5,14 +5,22 @@ convert_json_transcript.py
 This module converts AWS Transcribe JSON output into a readable transcript.
 It supports two methods for obtaining the transcript data:
   1. Converting from a local JSON file.
-  2. Converting by choosing an AWS Transcribe job from a specified S3 bucket.
+  2. Converting by choosing one of your AWS Transcribe jobs.
   
 The processed transcript is then displayed and saved to a file.
 """
 
+import bisect
+import functools
+import io
 import json
+import mmap
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
 import os
+import random
 import re
 import time
 import boto3
@@ -23,14 +31,73 @@ import questionary
 from ui_style import custom_style
 from utils import sanitize_path
 
-def print_welcome_message():
-    welcome_text = """
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson parses bytes directly and is considerably faster than stdlib json on
+# the large word-per-item payloads AWS Transcribe produces; fall back to the
+# stdlib when it isn't installed.
+_loads = orjson.loads if orjson else json.loads
+
+# Shared HTTP session so repeated transcript downloads (e.g. after waiting on
+# a job) reuse the same TCP/TLS connection.
+_session = requests.Session()
+
+# Above this size, a fully parsed transcript dict costs several times the
+# file size in memory, so prefer streaming with ijson when it's installed.
+_STREAMING_THRESHOLD = 100 * 1024 * 1024
+
+# S3 objects above this size are downloaded with parallel ranged GETs so the
+# transfer isn't bound by a single TCP stream.
+_PARALLEL_GET_THRESHOLD = 32 * 1024 * 1024
+_PARALLEL_GET_CHUNKS = 8
+
+# Characters not allowed in output filenames; runs collapse to one '_'
+_SAFE_NAME_RE = re.compile(r'[^\w\-_. ]+')
+
+# Only this many characters of the transcript are echoed to the terminal;
+# printing a multi-MB transcript blocks on stdout (painfully so over SSH)
+_PREVIEW_LIMIT = 4096
+
+@functools.lru_cache(maxsize=None)
+def _get_client(service_name):
+    """
+    Lazily create and cache one boto3 client per service.
+
+    Client construction loads service models from disk, so share a single
+    client across calls, retry loops and download threads.
+    """
+    return boto3.client(service_name)
+
+# Static CLI boilerplate lives at module scope instead of being rebuilt on
+# every call
+_WELCOME_MESSAGE = """
 ╔═ 🔄 ═══ 📝 ═══ ☁️ ═══ 📊 ═══ 🔄 ═══ 📝 ═══ ☁️ ═══ 📊 ═══ 🔄 ═╗
 ║        Convert an AWS Transcribe JSON Transcript!        ║
 ╚═ 🔄 ═══ 📝 ═══ ☁️ ═══ 📊 ═══ 🔄 ═══ 📝 ═══ ☁️ ═══ 📊 ═══ 🔄 ═╝
 
 """
-    print(welcome_text)
+
+_CONCLUDING_TEMPLATE = """
+╔════════════════════════════════════════════════════════════════════╗
+║              AWS Transcript Converter - Process Complete!          ║
+╚════════════════════════════════════════════════════════════════════╝
+
+Your transcript has been successfully processed and saved to:
+{output_file}
+
+Thank you for using the AWS Transcript Converter!
+"""
+
+def print_welcome_message():
+    print(_WELCOME_MESSAGE)
 
 def get_valid_file_path():
     """
@@ -49,68 +116,285 @@ def get_valid_file_path():
         except FileNotFoundError as e:
             print(f"\nError: {e}\n")
 
+def _reduce_transcript(f):
+    """
+    Stream-parse an oversized transcript JSON with ijson.
+
+    Only the fields process_transcript consumes are kept, so peak memory is
+    bounded by the segments/items payload instead of the whole document.
+    Segments and items are collected in a single pass over the event
+    stream, so f only needs to be readable, not seekable — a requests or
+    S3 streaming body can be fed in directly without buffering the whole
+    download first.
+
+    Args:
+        f: Binary file-like positioned at the start of the JSON.
+
+    Returns:
+        dict: Reduced transcript data in the usual results shape.
+    """
+    raw_segments = []
+    raw_items = []
+    builder = None
+    sink = None
+    depth = 0
+    for prefix, event, value in ijson.parse(f):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0:
+                    sink.append(builder.value)
+                    builder = None
+        elif event == 'start_map':
+            if prefix == 'results.speaker_labels.segments.item':
+                sink = raw_segments
+            elif prefix == 'results.items.item':
+                sink = raw_items
+            else:
+                continue
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            depth = 1
+
+    segments = [{
+        'speaker_label': segment.get('speaker_label'),
+        'start_time': segment.get('start_time'),
+        'end_time': segment.get('end_time'),
+    } for segment in raw_segments]
+    items = []
+    for item in raw_items:
+        alternatives = item.get('alternatives') or []
+        items.append({
+            'type': item.get('type'),
+            'speaker_label': item.get('speaker_label'),
+            'start_time': item.get('start_time'),
+            'end_time': item.get('end_time'),
+            'alternatives': [{'content': alternatives[0].get('content', '')}] if alternatives else [],
+        })
+    return {'results': {'speaker_labels': {'segments': segments}, 'items': items}}
+
+def _stream_transcript_from_file(file_path):
+    """
+    Stream-parse an oversized transcript JSON file with ijson.
+
+    Returns:
+        dict: Reduced transcript data in the usual results shape.
+    """
+    with open(file_path, 'rb') as f:
+        return _reduce_transcript(f)
+
+def _parse_transcript_bytes(body):
+    """
+    Parse raw downloaded transcript bytes.
+
+    Oversized payloads go through the ijson reduction when it's available,
+    so the parsed representation never balloons to several times the
+    download size.
+    """
+    if ijson and len(body) > _STREAMING_THRESHOLD:
+        return _reduce_transcript(io.BytesIO(body))
+    return _loads(body)
+
 def get_transcript_from_file():
     """
     Load transcript data from a local JSON file.
-    
+
     Returns:
-        dict: Parsed JSON data.
+        tuple: (parsed JSON data, sanitized file path). The path is returned
+        so callers can derive the output location without prompting again.
     """
     file_path = get_valid_file_path()
     try:
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-        return data
+        if ijson and os.path.getsize(file_path) > _STREAMING_THRESHOLD:
+            return _stream_transcript_from_file(file_path), file_path
+        with open(file_path, 'rb') as file:
+            if orjson:
+                try:
+                    # Let the parser read straight out of the page cache
+                    # instead of copying the whole file into userspace first.
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = orjson.loads(memoryview(mm))
+                except (ValueError, OSError):
+                    # Empty files and some platforms can't be mapped
+                    data = _loads(file.read())
+            else:
+                data = _loads(file.read())
+        return data, file_path
     except Exception as e:
         print(f"Error reading file: {e}")
         sys.exit(1)
 
+def _parallel_s3_get(s3_client, bucket, key, chunks=_PARALLEL_GET_CHUNKS):
+    """
+    Download an S3 object body, using parallel ranged GETs for large objects.
+
+    Small objects are fetched with one request; larger ones are split into
+    byte ranges fetched concurrently and written into a preallocated buffer.
+
+    Returns:
+        bytearray: The object body.
+    """
+    total = s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+    if total < _PARALLEL_GET_THRESHOLD:
+        s3_response = s3_client.get_object(Bucket=bucket, Key=key)
+        # Accumulate the body in 1 MiB chunks; large transcripts can run to
+        # tens of MB and a single read() forces one oversized allocation.
+        body = bytearray()
+        for chunk in s3_response['Body'].iter_chunks(chunk_size=1 << 20):
+            body += chunk
+        return body
+
+    chunk_size = -(-total // chunks)
+    body = bytearray(total)
+
+    def fetch(offset):
+        end = min(offset + chunk_size, total) - 1
+        s3_response = s3_client.get_object(Bucket=bucket, Key=key, Range=f'bytes={offset}-{end}')
+        body[offset:end + 1] = s3_response['Body'].read()
+
+    with ThreadPoolExecutor(max_workers=chunks) as executor:
+        # list() so any download error surfaces here
+        list(executor.map(fetch, range(0, total, chunk_size)))
+    return body
+
+def _s3_location(parsed_uri):
+    """
+    Resolve a parsed HTTPS URL to an S3 (bucket, key) pair when possible.
+
+    Recognizes both path-style endpoints (s3.amazonaws.com,
+    s3.<region>.amazonaws.com) and virtual-hosted ones
+    (<bucket>.s3.<region>.amazonaws.com), so transcript URLs are fetched
+    through the shared boto3 client — keep-alive pool, retries, parallel
+    ranged GETs — instead of a plain HTTPS request.
+
+    Presigned URLs are left alone: their auth lives in the query string,
+    which get_object would discard, and the objects they point at (e.g.
+    transcripts in the AWS-managed Transcribe bucket) are typically not
+    readable with the caller's own credentials.
+
+    Returns:
+        tuple or None: (bucket, key), or None if the URL should be
+        fetched over plain HTTPS instead.
+    """
+    query = parsed_uri.query
+    if query and ('X-Amz-Signature=' in query or 'X-Amz-Algorithm=' in query
+                  or 'AWSAccessKeyId=' in query):
+        return None
+    host = parsed_uri.netloc
+    key = urllib.parse.unquote(parsed_uri.path).lstrip('/')
+    if not host.endswith('.amazonaws.com') or not key:
+        return None
+    first_label = host.split('.', 1)[0]
+    if first_label == 's3' or first_label.startswith('s3-'):
+        # Path-style: first path component is the bucket
+        bucket, _, key = key.partition('/')
+        return (bucket, key) if bucket and key else None
+    bucket, sep, rest = host.partition('.s3')
+    if sep and rest.endswith('.amazonaws.com') and bucket:
+        # Virtual-hosted style: bucket is the host prefix
+        return bucket, key
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _load_transcript_from_uri(transcript_uri):
+    """
+    Download and parse the transcript JSON behind a transcript URI.
+
+    The most recent transcript is cached so converting the same job again
+    within a session skips the download. Kept to a single entry: parsed
+    transcripts can run to hundreds of MB, and presigned URIs get a fresh
+    signature on every describe so older entries would rarely hit anyway.
+
+    Returns:
+        dict: Parsed transcript data.
+    """
+    parsed_uri = urllib.parse.urlparse(transcript_uri)
+    location = _s3_location(parsed_uri)
+    if location:
+        bucket_name, key = location
+        data = _parse_transcript_bytes(_parallel_s3_get(_get_client('s3'), bucket_name, key))
+    else:
+        req_response = _session.get(transcript_uri, stream=True, timeout=60)
+        content_length = int(req_response.headers.get('Content-Length') or 0)
+        if ijson and content_length > _STREAMING_THRESHOLD:
+            # Feed the response body straight into the reducer so the raw
+            # download is never held in memory in full
+            req_response.raw.decode_content = True
+            data = _reduce_transcript(req_response.raw)
+        else:
+            data = _parse_transcript_bytes(req_response.content)
+    return data
+
+def _fetch_transcript(job):
+    """
+    Download and parse the transcript JSON for a completed transcription job.
+
+    Args:
+        job (dict): TranscriptionJob details from get_transcription_job.
+
+    Returns:
+        tuple: (parsed transcript data, transcript URI).
+    """
+    transcript_uri = job["Transcript"]["TranscriptFileUri"]
+    return _load_transcript_from_uri(transcript_uri), transcript_uri
+
+def _wait_for_job(transcribe_client, job_name):
+    """
+    Poll a transcription job until it reaches COMPLETED or FAILED.
+
+    Polls with exponential backoff (5 s doubling to a 60 s cap) plus a
+    little jitter, so a job that finishes quickly is picked up within
+    seconds while long jobs don't hammer the Transcribe API at a fixed
+    rate and risk throttling.
+
+    Returns:
+        dict: The final TranscriptionJob details.
+    """
+    delay = 5
+    while True:
+        time.sleep(delay + random.uniform(0, delay / 4))
+        job = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)["TranscriptionJob"]
+        if job["TranscriptionJobStatus"] in ("COMPLETED", "FAILED"):
+            return job
+        delay = min(delay * 2, 60)
+
 def get_transcript_from_bucket():
     """
-    Prompt the user for an S3 bucket name (defaulting to 'internal-audio-recordings'),
-    list all AWS Transcribe jobs whose MediaFileUri begins with that bucket's path,
-    and let the user choose one.
+    List all AWS Transcribe jobs and let the user choose one.
+
+    The job list is built from the list_transcription_jobs summaries alone;
+    full job details (including the transcript URI) are only fetched for the
+    job the user actually selects, avoiding one describe call per job.
     """
-    # Prompt for bucket name (default if blank)
-    bucket = questionary.text(
-        "Enter the S3 bucket name for the audio file (leave blank for default 'internal-audio-recordings'):",
-        style=custom_style
-    ).ask().strip() or "internal-audio-recordings"
+    transcribe_client = _get_client('transcribe')
 
-    transcribe_client = boto3.client('transcribe')
+    # Optional server-side narrowing; accounts can hold hundreds of jobs
+    name_filter = questionary.text(
+        "Filter jobs by name (leave blank to list all):",
+        style=custom_style
+    ).ask()
+    list_kwargs = {}
+    if name_filter and name_filter.strip():
+        list_kwargs["JobNameContains"] = name_filter.strip()
 
-    # Retrieve all transcription jobs (paginated)
+    # Retrieve the matching transcription jobs via the official paginator,
+    # which handles NextToken continuation for us
+    paginator = transcribe_client.get_paginator('list_transcription_jobs')
     all_jobs = []
-    response = transcribe_client.list_transcription_jobs()
-    all_jobs.extend(response.get("TranscriptionJobSummaries", []))
-    while "NextToken" in response:
-        response = transcribe_client.list_transcription_jobs(NextToken=response["NextToken"])
-        all_jobs.extend(response.get("TranscriptionJobSummaries", []))
-
-    # Filter jobs based on whether their MediaFileUri starts with the provided bucket
-    matching_jobs = []
-    for job_summary in all_jobs:
-        job_name = job_summary["TranscriptionJobName"]
-        job_details = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)["TranscriptionJob"]
-        media_uri = job_details.get("Media", {}).get("MediaFileUri", "")
-        if media_uri.startswith(f"s3://{bucket}/"):
-            matching_jobs.append(job_details)
-
-    if not matching_jobs:
-        print(f"No transcription jobs found for bucket '{bucket}'.")
-        retry = questionary.text(
-            "Would you like to try another bucket? (y/n):",
-            style=custom_style
-        ).ask().lower().strip()
-        if retry == 'y':
-            return get_transcript_from_bucket()
-        else:
-            sys.exit(1)
+    for page in paginator.paginate(PaginationConfig={'PageSize': 100}, **list_kwargs):
+        all_jobs.extend(page.get("TranscriptionJobSummaries", []))
+
+    if not all_jobs:
+        print("No matching transcription jobs found.")
+        sys.exit(1)
 
-    # Let the user select from the matching transcription jobs
+    # Let the user select from the transcription jobs
     job_choices = []
-    for job in matching_jobs:
-        job_choices.append(f"{job['TranscriptionJobName']} - {job['TranscriptionJobStatus']}")
+    for job_summary in all_jobs:
+        job_choices.append(f"{job_summary['TranscriptionJobName']} - {job_summary['TranscriptionJobStatus']}")
 
     selected = questionary.select(
         "Select a transcription job:",
@@ -121,74 +405,118 @@ def get_transcript_from_bucket():
     selected_job_name = selected.split(" - ")[0]
     final_job = transcribe_client.get_transcription_job(TranscriptionJobName=selected_job_name)["TranscriptionJob"]
 
-    if final_job["TranscriptionJobStatus"] == "COMPLETED":
-        transcript_uri = final_job["Transcript"]["TranscriptFileUri"]
-        parsed_uri = urllib.parse.urlparse(transcript_uri)
-        if parsed_uri.netloc == 's3.amazonaws.com':
-            path_parts = parsed_uri.path.lstrip('/').split('/')
-            bucket_name = path_parts[0]
-            key = '/'.join(path_parts[1:])
-            s3_client = boto3.client('s3')
-            s3_response = s3_client.get_object(Bucket=bucket_name, Key=key)
-            data = json.loads(s3_response['Body'].read().decode('utf-8'))
-        else:
-            req_response = requests.get(transcript_uri)
-            data = req_response.json()
-        return data, transcript_uri, selected_job_name  # Return data, URI, and job name
-    elif final_job["TranscriptionJobStatus"] == "FAILED":
-        print("Transcription job failed:", final_job.get("FailureReason", "Unknown error"))
-        sys.exit(1)
-    else:
+    if final_job["TranscriptionJobStatus"] not in ("COMPLETED", "FAILED"):
         print(f"Transcription job is currently {final_job['TranscriptionJobStatus']}.")
         wait_choice = questionary.text(
             "Would you like to wait for the job to complete? (y/n):",
             style=custom_style
         ).ask().lower().strip()
-        if wait_choice == "y":
-            while final_job["TranscriptionJobStatus"] not in ["COMPLETED", "FAILED"]:
-                time.sleep(30)
-                final_job = transcribe_client.get_transcription_job(TranscriptionJobName=selected_job_name)["TranscriptionJob"]
-            if final_job["TranscriptionJobStatus"] == "COMPLETED":
-                transcript_uri = final_job["Transcript"]["TranscriptFileUri"]
-                parsed_uri = urllib.parse.urlparse(transcript_uri)
-                if parsed_uri.netloc == 's3.amazonaws.com':
-                    path_parts = parsed_uri.path.lstrip('/').split('/')
-                    bucket_name = path_parts[0]
-                    key = '/'.join(path_parts[1:])
-                    s3_client = boto3.client('s3')
-                    s3_response = s3_client.get_object(Bucket=bucket_name, Key=key)
-                    data = json.loads(s3_response['Body'].read().decode('utf-8'))
-                else:
-                    req_response = requests.get(transcript_uri)
-                    data = req_response.json()
-                return data, transcript_uri, selected_job_name
-            else:
-                print("Job failed:", final_job.get("FailureReason", "Unknown error"))
-                sys.exit(1)
-        else:
+        if wait_choice != "y":
             sys.exit(1)
+        final_job = _wait_for_job(transcribe_client, selected_job_name)
 
-def process_transcript(data, speaker_names=None):
+    if final_job["TranscriptionJobStatus"] == "COMPLETED":
+        data, transcript_uri = _fetch_transcript(final_job)
+        return data, transcript_uri, selected_job_name  # Return data, URI, and job name
+    else:
+        print("Transcription job failed:", final_job.get("FailureReason", "Unknown error"))
+        sys.exit(1)
+
+def _count_speaker_labels(records):
     """
-    Process AWS Transcribe output into a readable transcript with speaker labels.
+    Count the distinct speaker labels across records (segments or items).
+
+    Transcribe labels are always 'spk_<int>' with small N, so an int bitmask
+    avoids allocating a set of short-lived strings; unexpected label formats
+    fall back to the plain set approach.
+    """
+    mask = 0
+    try:
+        for record in records:
+            label = record.get('speaker_label')
+            if label:
+                mask |= 1 << int(label[4:])
+    except (ValueError, IndexError):
+        return len({record['speaker_label'] for record in records if 'speaker_label' in record})
+    return bin(mask).count('1')
+
+def build_speaker_names(data, schema=None):
+    """
+    Prompt the user for a display name for each speaker label in the data.
+
+    All interactive prompting lives here so process_transcript stays a pure
+    data transformation and never blocks on stdin.
 
     Args:
         data (dict): AWS Transcribe output.
-        speaker_names (dict): Optional mapping of speaker labels to names.
+        schema (TranscriptSchema): Optional pre-sniffed schema; computed from
+            data when omitted.
 
     Returns:
-        str: Formatted transcript. Returns empty string if processing fails.
+        dict: Mapping of speaker labels to display names.
     """
-    if not data or 'results' not in data:
-        print("Error: Invalid or empty transcript data.")
-        return ""
+    if schema is None:
+        schema = sniff_schema(data)
+
+    sorted_labels = schema.present_labels
+
+    if len(sorted_labels) <= 1:
+        # Single speaker (or no labels at all): no need to prompt
+        single_speaker_label = sorted_labels[0] if sorted_labels else 'spk_0'
+        return {single_speaker_label: "Speaker"}
+
+    print(f"\nDetected {len(sorted_labels)} unique speaker labels: {', '.join(sorted_labels)}")
+    print("Please provide names for each speaker label for better readability.")
+
+    # One batched form renders a single prompt session for every speaker
+    # instead of a prompt_toolkit setup/teardown round-trip per label.
+    # Field keys are positional because raw labels aren't guaranteed to be
+    # valid identifiers.
+    fields = {
+        f"s{i}": questionary.text(
+            f"Enter a name for speaker label '{label}':",
+            validate=lambda name: bool(name.strip()) or "Name cannot be empty.",
+            style=custom_style
+        )
+        for i, label in enumerate(sorted_labels)
+    }
+    answers = questionary.form(**fields).ask()
+    if not answers: sys.exit("Operation cancelled.") # Handle ctrl+c
 
-    results = data['results']
+    return {label: answers[f"s{i}"].strip() for i, label in enumerate(sorted_labels)}
+
+@dataclass(slots=True)
+class TranscriptSchema:
+    """
+    Precomputed shape of one Transcribe payload.
+
+    Sniffed once per transcript so build_speaker_names, iter_transcript and
+    run_converter all consume the same normalized view instead of each
+    re-walking the results dict with their own isinstance/.get cascades.
+    """
+    segments: list        # normalized speaker segments (possibly reconstructed)
+    num_speakers: int     # 0 means speakers could not be determined
+    present_labels: list  # sorted unique speaker labels actually present
+    has_item_labels: bool # whether any item carries its own speaker_label
+
+def sniff_schema(data):
+    """
+    Analyze a Transcribe payload into a TranscriptSchema.
+
+    Handles the list format, the older dict format, and items-only payloads
+    (reconstructing segments by grouping consecutive same-speaker items), so
+    downstream code runs a single code path regardless of schema.
+
+    Args:
+        data (dict): AWS Transcribe output.
+
+    Returns:
+        TranscriptSchema: The normalized view of the payload.
+    """
+    results = (data or {}).get('results', {})
     speaker_segments = []
     num_speakers = 0
-    debug_mode = False  # Set to True for additional debugging output
 
-    # --- Determine Speaker Count and Get Segments ---
     try:
         if 'speaker_labels' in results:
             speaker_labels_data = results['speaker_labels']
@@ -204,246 +532,274 @@ def process_transcript(data, speaker_names=None):
 
             # If count wasn't explicit, deduce from segments
             if num_speakers == 0 and speaker_segments:
-                speaker_labels_set = {segment['speaker_label'] for segment in speaker_segments if 'speaker_label' in segment}
-                num_speakers = len(speaker_labels_set)
+                num_speakers = _count_speaker_labels(speaker_segments)
 
         # Fallback if speaker_labels structure is missing/empty but items exist
-        if num_speakers == 0 and 'items' in results and results['items']:
-             all_items = results['items']
-             speaker_labels_set = {item['speaker_label'] for item in all_items if 'speaker_label' in item}
-             num_speakers = len(speaker_labels_set)
-             if num_speakers > 0:
-                  print("Warning: Speaker labels structure missing, deduced count from items.")
-                  # Try to generate basic segments from items if speaker_segments is empty
-                  if not speaker_segments:
-                       print("Warning: No segments found, attempting to reconstruct from items (may be less accurate).")
-                       # This is complex - best effort: group consecutive items by speaker
-                       temp_segments = []
-                       current_seg = None
-                       for item in all_items:
-                           if item.get('type') == 'pronunciation' and 'speaker_label' in item:
-                               if current_seg and current_seg['speaker_label'] == item['speaker_label']:
-                                   current_seg['end_time'] = item['end_time']
-                                   current_seg['items'].append(item)
-                               else:
-                                   if current_seg: temp_segments.append(current_seg)
-                                   current_seg = {
-                                       'speaker_label': item['speaker_label'],
-                                       'start_time': item['start_time'],
-                                       'end_time': item['end_time'],
-                                       'items': [item] # Store items for content later
-                                   }
-                       if current_seg: temp_segments.append(current_seg)
-                       speaker_segments = temp_segments # Use reconstructed segments
-             else:
-                  print("Warning: No speaker labels found anywhere. Processing as single speaker.")
-                  num_speakers = 1 # Treat as single speaker
-
-        elif num_speakers == 0:
-             print("Error: Could not determine number of speakers.")
-             return "" # Cannot proceed without speaker info if expected
+        if num_speakers == 0 and results.get('items'):
+            all_items = results['items']
+            num_speakers = _count_speaker_labels(all_items)
+            if num_speakers > 0:
+                print("Warning: Speaker labels structure missing, deduced count from items.")
+                # Try to generate basic segments from items if speaker_segments is empty
+                if not speaker_segments:
+                    print("Warning: No segments found, attempting to reconstruct from items (may be less accurate).")
+                    # Best effort: group consecutive items by speaker
+                    temp_segments = []
+                    current_seg = None
+                    for item in all_items:
+                        if item.get('type') == 'pronunciation' and 'speaker_label' in item:
+                            if current_seg and current_seg['speaker_label'] == item['speaker_label']:
+                                current_seg['end_time'] = item['end_time']
+                            else:
+                                if current_seg: temp_segments.append(current_seg)
+                                current_seg = {
+                                    'speaker_label': item['speaker_label'],
+                                    'start_time': item['start_time'],
+                                    'end_time': item['end_time'],
+                                }
+                    if current_seg: temp_segments.append(current_seg)
+                    speaker_segments = temp_segments # Use reconstructed segments
+            else:
+                print("Warning: No speaker labels found anywhere. Processing as single speaker.")
+                num_speakers = 1 # Treat as single speaker
 
     except (KeyError, IndexError, TypeError) as e:
         print(f"Error accessing speaker label data: {e}")
         print("Attempting to process as single speaker.")
         num_speakers = 1 # Fallback
 
-    # --- Get Speaker Names ---
-    if num_speakers > 1 and speaker_names is None:
+    present_labels = sorted({seg.get('speaker_label') for seg in speaker_segments if seg.get('speaker_label')})
+    if not present_labels and results.get('items'):
+        present_labels = sorted({item.get('speaker_label') for item in results['items'] if item.get('speaker_label')})
+
+    # any() stops at the first labelled item, so this is cheap whenever
+    # labels exist at all
+    has_item_labels = any('speaker_label' in item for item in results.get('items', []))
+
+    return TranscriptSchema(
+        segments=speaker_segments,
+        num_speakers=num_speakers,
+        present_labels=present_labels,
+        has_item_labels=has_item_labels,
+    )
+
+def iter_transcript(data, speaker_names=None, schema=None):
+    """
+    Yield the formatted transcript one speaker block at a time.
+
+    This generator is a pure data transformation: it never prompts. Use
+    build_speaker_names to collect display names beforehand; labels without
+    an entry fall back to the raw speaker label. Streaming the blocks lets
+    callers write very long transcripts to disk without holding the whole
+    string in memory; use process_transcript for a single string.
+
+    Args:
+        data (dict): AWS Transcribe output.
+        speaker_names (dict): Optional mapping of speaker labels to names.
+        schema (TranscriptSchema): Optional pre-sniffed schema; computed from
+            data when omitted.
+
+    Yields:
+        str: One formatted speaker block, separators included.
+    """
+    if not data or 'results' not in data:
+        print("Error: Invalid or empty transcript data.")
+        return
+
+    results = data['results']
+    debug_mode = False  # Set to True for additional debugging output
+
+    if schema is None:
+        schema = sniff_schema(data)
+    speaker_segments = schema.segments
+    num_speakers = schema.num_speakers
+    if num_speakers == 0:
+        print("Error: Could not determine number of speakers.")
+        return # Cannot proceed without speaker info if expected
+
+    # --- Speaker Names ---
+    if speaker_names is None:
+        # No names were collected up front (see build_speaker_names): fall
+        # back to the raw labels, or "Speaker" for single-speaker data,
+        # rather than prompting from inside the transformation.
         speaker_names = {}
-        # Get unique speaker labels present in the actual segments or items
-        present_speaker_labels = set()
-        if speaker_segments:
-             present_speaker_labels.update(seg.get('speaker_label') for seg in speaker_segments if seg.get('speaker_label'))
-        elif results.get('items'):
-             present_speaker_labels.update(item.get('speaker_label') for item in results['items'] if item.get('speaker_label'))
-
-        sorted_labels = sorted(list(present_speaker_labels))
-
-        print(f"\nDetected {len(sorted_labels)} unique speaker labels: {', '.join(sorted_labels)}")
-        print("Please provide names for each speaker label for better readability.")
-
-        for label in sorted_labels:
-            while True:
-                name = questionary.text(
-                    f"Enter a name for speaker label '{label}':",
-                    style=custom_style
-                ).ask()
-                if name is None: sys.exit("Operation cancelled.") # Handle ctrl+c
-                name = name.strip()
-                if name:
-                    speaker_names[label] = name
-                    break
-                print("Name cannot be empty. Please try again.")
-
-    elif num_speakers <= 1 and speaker_names is None:
-        # Handle single speaker or no speaker labels case
-        single_speaker_label = next((seg.get('speaker_label') for seg in speaker_segments if seg.get('speaker_label')), 'spk_0')
-        speaker_names = {single_speaker_label: "Speaker"} # Default name
+        if num_speakers <= 1:
+            single_speaker_label = next((seg.get('speaker_label') for seg in speaker_segments if seg.get('speaker_label')), 'spk_0')
+            speaker_names[single_speaker_label] = "Speaker"
 
     # --- Process Segments ---
-    transcript_parts = []
-    current_speaker_name = None
-    current_text_parts = []
     all_items = results.get('items', []) # Get top-level items once
 
+    # Extract pronunciation items in a single pass; the single-speaker block,
+    # the fast path, the matcher and the fallback below all reuse these
+    # structures instead of re-walking results['items'] with fresh dict.get
+    # chains each time.
+    pron_contents = []   # content of every pronunciation item, in order
+    pron_times = []      # (midpoint, content, label) for items with valid times
+    item_by_start = {}   # raw start_time string -> content
+    for item in all_items:
+        if item.get('type') != 'pronunciation' or not item.get('alternatives'):
+            continue
+        content = item['alternatives'][0]['content']
+        pron_contents.append(content)
+        start_str = item.get('start_time')
+        if start_str:
+            item_by_start[start_str] = content
+        try:
+            item_start = float(start_str)
+            item_end = float(item['end_time'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        item_label = item.get('speaker_label')
+        pron_times.append((
+            (item_start + item_end) / 2,
+            content,
+            sys.intern(item_label) if item_label else None,
+        ))
+
     if not speaker_segments and num_speakers == 1 and all_items:
          # Special case: No segments, but items exist, treat as one speaker block
          print("Processing transcript as a single speaker block.")
-         words = [item['alternatives'][0]['content']
-                  for item in all_items
-                  if item.get('type') == 'pronunciation' and item.get('alternatives')]
+         words = pron_contents
          if words:
               single_speaker_label = next(iter(speaker_names.keys()), 'spk_0') # Get the label used
               speaker_display_name = speaker_names.get(single_speaker_label, "Speaker")
-              return f"{speaker_display_name}: {' '.join(words)}"
-         else:
-              return "" # No content
-
-    # Map all speaker labels to their segments for easier matching
-    speaker_time_ranges = {}
+              yield f"{speaker_display_name}: {' '.join(words)}"
+         return
+
+    # Parse segments once into a time-ordered list of (start, end, label).
+    # Both segments and items come out of Transcribe in time order, so items
+    # can be matched against segments in a single merge pass below instead of
+    # re-scanning every segment for every item.
+    segment_ranges = []
     for segment in speaker_segments:
         speaker_label = segment.get('speaker_label')
         if not speaker_label:
             continue
-        
-        start_time_str = segment.get('start_time')
-        end_time_str = segment.get('end_time')
-        
-        if not all([start_time_str, end_time_str]):
-            continue
-            
+
         try:
-            start_time = float(start_time_str)
-            end_time = float(end_time_str)
-            
-            if speaker_label not in speaker_time_ranges:
-                speaker_time_ranges[speaker_label] = []
-                
-            speaker_time_ranges[speaker_label].append((start_time, end_time))
-        except ValueError:
-            continue
-    
-    # Second approach: match items to speakers by time ranges
-    speaker_texts = {}
-    for item in all_items:
-        if item.get('type') != 'pronunciation' or not item.get('alternatives'):
-            continue
-            
-        item_start_str = item.get('start_time')
-        item_end_str = item.get('end_time')
-        
-        if not all([item_start_str, item_end_str]):
+            start_time = float(segment['start_time'])
+            end_time = float(segment['end_time'])
+        except (KeyError, TypeError, ValueError):
             continue
-            
-        try:
-            item_start = float(item_start_str)
-            item_end = float(item_end_str)
-            item_midpoint = (item_start + item_end) / 2
-            
-            # Try to find which speaker was talking at this time
-            matched_speaker = None
-            
+
+        # Interned labels make the per-item dict lookups below compare by
+        # identity instead of hashing a fresh string from the JSON parser
+        segment_ranges.append((start_time, end_time, sys.intern(speaker_label)))
+    segment_ranges.sort(key=lambda r: r[0])
+
+    # Collect (speaker, words) runs in chronological order so alternating
+    # turns stay interleaved in the output instead of each speaker's whole
+    # text being grouped into one block.
+    runs = []  # list of [speaker_label, [words]]
+
+    # Fast path: modern Transcribe output embeds item references inside each
+    # segment, so the item-to-segment assignment is already done for us. Map
+    # the references back to their content by start time.
+    if speaker_segments and all('items' in seg for seg in speaker_segments):
+        for segment in speaker_segments:
+            speaker_label = segment.get('speaker_label')
+            if not speaker_label:
+                continue
+            words = [item_by_start[seg_item['start_time']]
+                     for seg_item in segment['items']
+                     if seg_item.get('start_time') in item_by_start]
+            if words:
+                speaker_label = sys.intern(speaker_label)
+                if runs and runs[-1][0] == speaker_label:
+                    runs[-1][1].extend(words)
+                else:
+                    runs.append([speaker_label, words])
+
+    # Otherwise match each item to a segment by binary-searching the sorted
+    # segment starts, O(log m) per item regardless of item ordering
+    if not runs:
+        segment_starts = [r[0] for r in segment_ranges]
+        num_segments = len(segment_ranges)
+        for item_midpoint, content, item_label in pron_times:
             # First try speaker_label in the item if it exists
-            item_speaker = item.get('speaker_label')
-            if item_speaker:
-                matched_speaker = item_speaker
-            else:
-                # Otherwise check time ranges
-                for speaker, time_ranges in speaker_time_ranges.items():
-                    for start, end in time_ranges:
-                        # Use looser matching - only require the midpoint to be in range
-                        if item_midpoint >= start and item_midpoint <= end:
-                            matched_speaker = speaker
-                            break
-                    if matched_speaker:
-                        break
-            
-            # If still no match, assign to closest speaker segment
-            if not matched_speaker and speaker_time_ranges:
-                min_distance = float('inf')
-                for speaker, time_ranges in speaker_time_ranges.items():
-                    for start, end in time_ranges:
-                        if item_midpoint < start:
-                            distance = start - item_midpoint
-                        elif item_midpoint > end:
-                            distance = item_midpoint - end
-                        else:
-                            distance = 0  # It's within range
-                            
-                        if distance < min_distance:
-                            min_distance = distance
-                            matched_speaker = speaker
-            
-            # If we found a speaker, add the word to their text
+            matched_speaker = item_label
+            if not matched_speaker and num_segments:
+                # Rightmost segment whose start is <= the item's midpoint
+                seg_index = bisect.bisect_right(segment_starts, item_midpoint) - 1
+
+                if seg_index >= 0 and segment_ranges[seg_index][1] >= item_midpoint:
+                    # Looser matching - only require the midpoint to be in range
+                    matched_speaker = segment_ranges[seg_index][2]
+                else:
+                    # Between segments: assign to whichever neighbour is closer
+                    candidates = []
+                    if seg_index >= 0:
+                        _, prev_end, prev_label = segment_ranges[seg_index]
+                        candidates.append((item_midpoint - prev_end, prev_label))
+                    if seg_index + 1 < num_segments:
+                        next_start, _, next_label = segment_ranges[seg_index + 1]
+                        candidates.append((next_start - item_midpoint, next_label))
+                    if candidates:
+                        matched_speaker = min(candidates)[1]
+
+            # If we found a speaker, add the word to the current run
             if matched_speaker:
-                if matched_speaker not in speaker_texts:
-                    speaker_texts[matched_speaker] = []
-                    
-                speaker_texts[matched_speaker].append(item['alternatives'][0]['content'])
-                
-        except ValueError:
-            continue
-    
-    # If we got any speaker texts, build the transcript
-    if speaker_texts:
-        # Order speakers by their first segment's start time
-        ordered_speakers = []
-        for speaker in speaker_texts.keys():
-            # Find earliest segment for this speaker
-            if speaker in speaker_time_ranges and speaker_time_ranges[speaker]:
-                earliest_time = min(start for start, _ in speaker_time_ranges[speaker])
-                ordered_speakers.append((speaker, earliest_time))
-        
-        # Sort by earliest start time
-        ordered_speakers.sort(key=lambda x: x[1])
-        
-        # Build transcript
-        for speaker, _ in ordered_speakers:
-            speaker_name = speaker_names.get(speaker, speaker)
-            speaker_text = ' '.join(speaker_texts[speaker])
-            if speaker_text.strip():
-                transcript_parts.append(f"\n{speaker_name}: {speaker_text}")
-                
-        final_transcript = ''.join(transcript_parts).strip()
-        if final_transcript:
-            return final_transcript
-    
+                if runs and runs[-1][0] == matched_speaker:
+                    runs[-1][1].append(content)
+                else:
+                    runs.append([matched_speaker, [content]])
+
+    # If we got any runs, emit them in order
+    if runs:
+        # The label-to-display mapping is fixed for the whole transcript, so
+        # format each prefix once per label
+        display_prefix = {}
+        emitted = False
+        for speaker, words in runs:
+            if not words:
+                continue
+            prefix = display_prefix.get(speaker)
+            if prefix is None:
+                prefix = f"{speaker_names.get(speaker, speaker)}: "
+                display_prefix[speaker] = prefix
+            separator = '\n' if emitted else ''
+            yield f"{separator}{prefix}{' '.join(words)}"
+            emitted = True
+
+        if emitted:
+            return
+
     # If we still don't have a transcript, fall back to the original method
     if debug_mode:
         print(f"DEBUG: {len(speaker_segments)} segments found")
         print(f"DEBUG: {len(all_items)} items found")
-        print(f"DEBUG: Speaker time ranges: {speaker_time_ranges}")
+        print(f"DEBUG: Segment ranges: {segment_ranges}")
 
     # Fallback if processing yielded nothing but there was data
     if all_items:
          print("Warning: Segment processing yielded empty transcript. Falling back to basic concatenation.")
-         words = [item['alternatives'][0]['content']
-                  for item in all_items
-                  if item.get('type') == 'pronunciation' and item.get('alternatives')]
+         words = pron_contents
          if words:
               # Try to use the first speaker name if available
               first_label = next(iter(speaker_names.keys()), 'spk_0')
               speaker_display_name = speaker_names.get(first_label, "Speaker")
-              return f"{speaker_display_name}: {' '.join(words)}"
-         else:
-              return "" # No content found at all
+              yield f"{speaker_display_name}: {' '.join(words)}"
     else:
          print("Warning: No items found in transcript results.")
-         return ""
 
-def print_concluding_message(output_file):
-    concluding_message = f"""
-╔════════════════════════════════════════════════════════════════════╗
-║              AWS Transcript Converter - Process Complete!          ║
-╚════════════════════════════════════════════════════════════════════╝
+def process_transcript(data, speaker_names=None):
+    """
+    Process AWS Transcribe output into a readable transcript with speaker labels.
 
-Your transcript has been successfully processed and saved to:
-{output_file}
+    Thin wrapper around iter_transcript for callers that want one string.
 
-Thank you for using the AWS Transcript Converter!
-"""
-    print(concluding_message)
+    Args:
+        data (dict): AWS Transcribe output.
+        speaker_names (dict): Optional mapping of speaker labels to names.
+
+    Returns:
+        str: Formatted transcript. Returns empty string if processing fails.
+    """
+    return ''.join(iter_transcript(data, speaker_names))
+
+def print_concluding_message(output_file):
+    print(_CONCLUDING_TEMPLATE.format(output_file=output_file))
 
 def run_converter():
     """
@@ -457,7 +813,7 @@ def run_converter():
         "Choose a conversion method:",
         choices=[
             "🗃️ Convert from a JSON file on your computer",
-            "☁️ Convert using an AWS Transcribe job (select by bucket)"
+            "☁️ Convert using an AWS Transcribe job (select from your jobs)"
         ],
         style=custom_style,
         pointer="👉 "
@@ -473,16 +829,15 @@ def run_converter():
     if choice == "🗃️ Convert from a JSON file on your computer":
         data, json_file = get_transcript_from_file() # Now gets path too
         if data and json_file:
-            output_dir = os.path.dirname(json_file)
-            base_name = os.path.splitext(os.path.basename(json_file))[0]
-            # Sanitize base_name further if needed for filenames
-            safe_base_name = re.sub(r'[^\w\-_\. ]', '_', base_name)
-            output_file = os.path.join(output_dir, f"{safe_base_name}_processed.txt")
-    elif choice == "☁️ Convert using an AWS Transcribe job (select by bucket)":
+            # One Path parse replaces separate dirname/basename/splitext calls
+            json_path = Path(json_file)
+            safe_base_name = _SAFE_NAME_RE.sub('_', json_path.stem)
+            output_file = str(json_path.with_name(f"{safe_base_name}_processed.txt"))
+    elif choice == "☁️ Convert using an AWS Transcribe job (select from your jobs)":
         data, transcript_uri, job_name = get_transcript_from_bucket()
         if data and job_name:
             # Use the transcription job name for the output file
-            safe_job_name = re.sub(r'[^\w\-_\. ]', '_', job_name)
+            safe_job_name = _SAFE_NAME_RE.sub('_', job_name)
             output_file = os.path.join(os.getcwd(), f"{safe_job_name}_processed.txt")
     else:
         print("Invalid choice.")
@@ -500,13 +855,13 @@ def run_converter():
 
 
     try:
-        # Check if speaker labels exist before calling process_transcript
-        has_speaker_labels = 'speaker_labels' in data.get('results', {}) and \
-                             data['results']['speaker_labels']
-        has_items_with_labels = any('speaker_label' in item for item in data.get('results', {}).get('items', []))
+        # Sniff the payload shape once; the same schema feeds name prompting
+        # and transcript generation below
+        schema = sniff_schema(data)
 
-        if has_speaker_labels or has_items_with_labels:
-            transcript = process_transcript(data)
+        if schema.present_labels or schema.has_item_labels:
+            speaker_names = build_speaker_names(data, schema)
+            chunks = iter_transcript(data, speaker_names, schema)
         else:
             print("\nWarning: No speaker label information found in the transcript.")
             print("Processing as a single speaker.")
@@ -515,12 +870,34 @@ def run_converter():
             words = [item['alternatives'][0]['content']
                      for item in items
                      if item.get('type') == 'pronunciation' and item.get('alternatives')]
-            transcript = "Speaker: " + ' '.join(words) if words else ""
+            chunks = iter(["Speaker: " + ' '.join(words)]) if words else iter(())
+
+        # Ensure the output directory exists
+        output_dir = os.path.dirname(output_file)
+        if output_dir: # Check if output_dir is not empty (happens if saving in cwd)
+            os.makedirs(output_dir, exist_ok=True)
 
-        # Ensure transcript is a string, not None
-        if transcript is None:
-            transcript = ""
-            print("\nWarning: Processing resulted in empty transcript.")
+        print("\nProcessed Transcript:")
+        print("=" * 50)
+
+        # Stream each block to disk as it's produced so the full transcript
+        # never has to be held in memory as one string; only the first few
+        # KB are echoed to the terminal. The large write buffer keeps disk
+        # flushes from happening every default-sized block.
+        chars_written = 0
+        chars_printed = 0
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                if chars_printed < _PREVIEW_LIMIT:
+                    remaining = _PREVIEW_LIMIT - chars_printed
+                    print(chunk[:remaining], end='')
+                    chars_printed += min(len(chunk), remaining)
+                chars_written += len(chunk)
+        if chars_written > chars_printed:
+            print(f"\n… ({chars_written - chars_printed} more characters truncated; see {output_file})", end='')
+        print()
+        print("=" * 50)
 
     except Exception as e:
         # Catch potential errors during processing (like unexpected structure deeper in)
@@ -529,35 +906,19 @@ def run_converter():
         traceback.print_exc() # Print full traceback for debugging
         sys.exit(1)
 
-    if not transcript:
+    if chars_written == 0:
          print("\nWarning: Processed transcript is empty.")
-         # Ask user if they still want to save the empty file?
+         # Ask user if they still want to keep the empty file?
          save_empty = questionary.confirm(
-            "Do you want to save the empty transcript file?",
+            "Do you want to keep the empty transcript file?",
             default=False,
             style=custom_style
          ).ask()
          if not save_empty:
+             os.remove(output_file)
              print("Skipping save for empty transcript.")
              sys.exit(0)
 
-    print("\nProcessed Transcript:")
-    print("=" * 50)
-    print(transcript)
-    print("=" * 50)
-
-    try:
-        # Ensure the output directory exists
-        output_dir = os.path.dirname(output_file)
-        if output_dir: # Check if output_dir is not empty (happens if saving in cwd)
-            os.makedirs(output_dir, exist_ok=True)
-
-        with open(output_file, 'w', encoding='utf-8') as f: # Specify encoding
-            f.write(transcript)
-    except Exception as e:
-        print(f"Error saving transcript to '{output_file}': {e}")
-        sys.exit(1)
-
     print_concluding_message(output_file)
 
 if __name__ == "__main__":
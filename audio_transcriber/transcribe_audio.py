@@ -6,15 +6,41 @@ This module provides an interactive interface to start an AWS Transcribe job.
 It lets you choose between uploading a local audio file to S3 and transcribing it, or using an existing S3 URI for transcription.
 """
 
+import functools
 import re
 import time
 import os
 import boto3
 import questionary
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from ui_style import custom_style
 from utils import sanitize_path
 
+# Characters not allowed in Transcribe job names; compiled once since the
+# sanitization runs for every job started
+_JOB_NAME_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
+@functools.lru_cache(maxsize=None)
+def _get_client(service_name):
+    """
+    Lazily create and cache one boto3 client per service.
+
+    Client construction loads service models from disk; sharing a client
+    also reuses its HTTPS connection pool across the validate/upload/start
+    steps of a run.
+    """
+    return boto3.client(service_name)
+
+# Audio files routinely run to hundreds of MB; parallel multipart uploads
+# keep the transfer from being bound by a single TCP stream.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
 def print_welcome_message():
     welcome_text = """
 ╔═ 🎤 ═══ ☁️ ═══ 🔊 ═══ 📡 ═══ 🎤 ═══ ☁️ ═══ 🔊 ═══ 📡 ═══ 🎤 ═╗
@@ -38,9 +64,8 @@ def create_job_name(s3_path):
     """
     Create a transcription job name based on the S3 file name.
     """
-    filename = s3_path.split("/")[-1]
-    base_name = filename.split(".")[0]
-    job_name = re.sub(r'[^a-zA-Z0-9_-]', '-', base_name)
+    base_name = s3_path.rpartition("/")[-1].partition(".")[0]
+    job_name = _JOB_NAME_RE.sub('-', base_name)
     if not job_name:
         job_name = "transcription-job"
     return job_name
@@ -49,37 +74,26 @@ def start_transcription_job(s3_path, speaker_count):
     """
     Start an AWS Transcribe job with the specified S3 path and speaker count.
     """
-    client = boto3.client('transcribe')
+    client = _get_client('transcribe')
     job_name = create_job_name(s3_path)
-    media_format = s3_path.split('.')[-1].lower()
+    media_format = s3_path.rpartition('.')[-1].lower()
+    params = {
+        'TranscriptionJobName': job_name,
+        'Media': {'MediaFileUri': s3_path},
+        'MediaFormat': media_format,
+        'LanguageCode': 'en-US',
+        'Settings': {
+            'ShowSpeakerLabels': True,
+            'MaxSpeakerLabels': speaker_count,
+            'ChannelIdentification': True
+        }
+    }
     try:
-        response = client.start_transcription_job(
-            TranscriptionJobName=job_name,
-            Media={'MediaFileUri': s3_path},
-            MediaFormat=media_format,
-            LanguageCode='en-US',
-            Settings={
-                'ShowSpeakerLabels': True,
-                'MaxSpeakerLabels': speaker_count,
-                'ChannelIdentification': True
-            }
-        )
-        return response
+        return client.start_transcription_job(**params)
     except client.exceptions.ConflictException:
         # Add a timestamp if job name already exists.
-        job_name = f"{job_name}-{int(time.time())}"
-        response = client.start_transcription_job(
-            TranscriptionJobName=job_name,
-            Media={'MediaFileUri': s3_path},
-            MediaFormat=media_format,
-            LanguageCode='en-US',
-            Settings={
-                'ShowSpeakerLabels': True,
-                'MaxSpeakerLabels': speaker_count,
-                'ChannelIdentification': True
-            }
-        )
-        return response
+        params['TranscriptionJobName'] = f"{job_name}-{int(time.time())}"
+        return client.start_transcription_job(**params)
     except Exception as e:
         raise Exception(f"Failed to start transcription job: {e}")
 
@@ -87,7 +101,7 @@ def validate_bucket_exists(bucket_name):
     """
     Check if an S3 bucket exists and is accessible.
     """
-    s3 = boto3.client('s3')
+    s3 = _get_client('s3')
     try:
         s3.head_bucket(Bucket=bucket_name)
         return True
@@ -105,15 +119,25 @@ def upload_audio_file(local_file_path, bucket, object_name=None):
     """
     Upload a local audio file to the specified S3 bucket.
     """
-    s3 = boto3.client('s3')
+    s3 = _get_client('s3')
     if object_name is None:
         object_name = os.path.basename(local_file_path)
     try:
         if not os.path.isfile(local_file_path):
             raise FileNotFoundError(f"Local file '{local_file_path}' not found")
             
+        total_bytes = os.path.getsize(local_file_path)
         print(f"Uploading {local_file_path} to bucket {bucket}...")
-        s3.upload_file(local_file_path, bucket, object_name)
+
+        uploaded = 0
+        def report_progress(chunk_bytes):
+            nonlocal uploaded
+            uploaded += chunk_bytes
+            print(f"\r  {uploaded / (1 << 20):.1f} / {total_bytes / (1 << 20):.1f} MB", end='', flush=True)
+
+        s3.upload_file(local_file_path, bucket, object_name,
+                       Config=_TRANSFER_CONFIG, Callback=report_progress)
+        print()
         s3_uri = f"s3://{bucket}/{object_name}"
         print("✓ Upload successful!")
         return s3_uri
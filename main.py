@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import sys
 import questionary
-from audio_transcriber import run_transcription_menu, run_converter_json
-from vtt_transcript_cleaner import run_cleaner
 from ui_style import custom_style
 
+# The tool modules are imported lazily inside the menu branches:
+# audio_transcriber pulls in boto3, whose service-index load costs hundreds
+# of milliseconds, and a user cleaning a VTT file never needs it.
+
 def display_welcome():
     banner = r"""                   
                     ✼✼✼✼✼✼                    
@@ -56,10 +58,13 @@ def main():
     while True:
         choice = main_menu()
         if choice == "🧹 Clean a VTT Transcript":
+            from vtt_transcript_cleaner import run_cleaner
             run_cleaner()
         elif choice == "☁️ Transcribe Audio (with AWS Transcribe)":
+            from audio_transcriber import run_transcription_menu
             run_transcription_menu()
         elif choice == "🔄 Convert an AWS Transcribe JSON Transcript":
+            from audio_transcriber import run_converter_json
             run_converter_json()
         elif choice == "🚪 Exit":
             print("👋 Goodbye! See you next time!")
@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
+import functools
 import os
 import re
 
+# Compiled once; sanitize_path runs on every interactive path prompt
+_UNESCAPE_RE = re.compile(r'\\(.)')
+
+@functools.lru_cache(maxsize=256)
 def sanitize_path(input_path):
     """
     Sanitize and validate the input file path.
+
+    Results are memoized per input string: batch callers and retries
+    re-sanitize the same path repeatedly, and the regex plus stat calls are
+    pure overhead the second time. Failed lookups raise and are not cached,
+    so a path that comes into existence later still resolves.
     
     Args:
         input_path (str): Raw input path.
@@ -20,17 +30,20 @@ def sanitize_path(input_path):
     # Handle doubled backslashes
     path = path.replace("\\\\", "\\")
     
-    # Create variations of the path to try
-    paths_to_try = [
-        path,  # Original path
-        path.replace("\\ ", " ").replace("\\(", "(").replace("\\)", ")"),
-        re.sub(r'\\(.)', r'\1', path),
-    ]
-    
-    for p in paths_to_try:
-        if os.path.exists(p.strip()):
-            return p.strip()
-    
+    # Most inputs are already valid as-is; only compute the unescaped
+    # variations on a miss, and only when there is a backslash to unescape
+    if os.path.exists(path):
+        return path
+
+    if '\\' in path:
+        unescaped = path.replace("\\ ", " ").replace("\\(", "(").replace("\\)", ")")
+        if unescaped != path and os.path.exists(unescaped):
+            return unescaped
+
+        fully_unescaped = _UNESCAPE_RE.sub(r'\1', path)
+        if fully_unescaped != unescaped and os.path.exists(fully_unescaped):
+            return fully_unescaped
+
     raise FileNotFoundError(
         "Could not find the file. Please ensure the path is correct "
         "and try again."
@@ -38,10 +51,6 @@ def sanitize_path(input_path):
 
 def verify_file_exists(path):
     """
-    Check if a file exists by attempting to open it.
+    Check if a file exists with a single stat, no open/close probe.
     """
-    try:
-        with open(path, 'r') as f:
-            return True
-    except (IOError, OSError):
-        return False
\ No newline at end of file
+    return os.path.isfile(path)
\ No newline at end of file